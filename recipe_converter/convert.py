@@ -1,10 +1,16 @@
+import collections.abc
 import pathlib
+import queue
+import threading
 from typing import Protocol
 
 import click
 
 from . import mealmaster, melarecipes
 
+# Upper bound for recipes parsed ahead of the writer.
+_PARSE_QUEUE_SIZE = 64
+
 
 class Converter(Protocol):
     def __call__(self, input: pathlib.Path, output: pathlib.Path) -> None: ...
@@ -12,11 +18,13 @@ class Converter(Protocol):
 
 def mealmaster_to_melarecipe(mm_recipe: mealmaster.Recipe) -> melarecipes.Recipe:
     """Convert a Meal-Master recipe to a Mela recipe."""
-    ingredients = ""
+    ingredient_parts = []
     for group in mm_recipe.ingredients_groups:
         if group.title:
-            ingredients += f"# {group.title}\n"
-        ingredients += f"{'\n'.join(group.ingredients)}\n"
+            ingredient_parts.append(f"# {group.title}\n")
+        ingredient_parts.append("\n".join(group.ingredients))
+        ingredient_parts.append("\n")
+    ingredients = "".join(ingredient_parts)
 
     melarecipe = melarecipes.Recipe(
         title=mm_recipe.title,
@@ -36,15 +44,46 @@ def mealmaster_to_melarecipe(mm_recipe: mealmaster.Recipe) -> melarecipes.Recipe
 
 
 def mealmaster_to_melarecipes(input: pathlib.Path, output: pathlib.Path):
-    with input.open("r") as file:
-        mm_recipes = mealmaster.parse(file)
-        mela_recipes = []
+    """Convert a Meal-Master file to a melarecipes archive.
+
+    Parsing and writing are pipelined: a producer thread parses and converts the recipes
+    into a bounded queue while the archive is written from it, so the zip write overlaps
+    the parsing work.
+    """
+    recipe_queue: queue.Queue[melarecipes.Recipe | None] = queue.Queue(maxsize=_PARSE_QUEUE_SIZE)
+    producer_error: list[Exception] = []
+
+    def _produce() -> None:
+        try:
+            with input.open("r") as file:
+                for mm_recipe in mealmaster.parse(file):
+                    recipe_queue.put(mealmaster_to_melarecipe(mm_recipe))
+        except Exception as exc:
+            producer_error.append(exc)
+        finally:
+            # Sentinel signalling the end of the recipes.
+            recipe_queue.put(None)
+
+    sentinel_seen = threading.Event()
 
-        for mm_recipe in mm_recipes:
-            mela_recipes.append(mealmaster_to_melarecipe(mm_recipe))
+    def _consume() -> collections.abc.Generator[melarecipes.Recipe, None, None]:
+        while (recipe := recipe_queue.get()) is not None:
+            yield recipe
+        sentinel_seen.set()
 
-        print("Parsed and converted", len(mela_recipes), "recipes")
-        melarecipes.write(output, mela_recipes)
+    producer = threading.Thread(target=_produce, name="mealmaster-parser")
+    producer.start()
+    try:
+        num_recipes = melarecipes.write(output, _consume())
+    finally:
+        # If the writer stopped early, drain the queue so the producer is not blocked on put().
+        while not sentinel_seen.is_set():
+            if recipe_queue.get() is None:
+                sentinel_seen.set()
+        producer.join()
+    if producer_error:
+        raise producer_error[0]
+    print("Parsed and converted", num_recipes, "recipes")
 
 
 CONVERTERS: tuple[tuple[str, str, Converter], ...] = ((".mmf", ".melarecipes", mealmaster_to_melarecipes),)
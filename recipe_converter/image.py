@@ -15,7 +15,7 @@ def scale_down(data: bytes, height: int | None = None, width: int | None = None)
     :param data: The image data as bytes.
     :param height: The maximum height of the image, optional
     :param width: The maximum width of the image, optional
-    :return: The scaled down image data as bytes.
+    :return: The scaled down image, encoded in the format of the input data.
     """
     if not height and not width:
         raise ValueError("At least one of height or width must be given.")
@@ -25,8 +25,21 @@ def scale_down(data: bytes, height: int | None = None, width: int | None = None)
     image = Image.open(io.BytesIO(data))
     if height and image.height >= height:
         _logger.debug("Scaling down image to height %d px", height)
-        return image.resize((int(image.width * height / image.height), height)).tobytes()
-    if width and image.width >= width:
+        size = (int(image.width * height / image.height), height)
+    elif width and image.width >= width:
         _logger.debug("Scaling down image to width %d px", width)
-        return image.resize((width, int(image.height * width / image.width))).tobytes()
-    return data
+        size = (width, int(image.height * width / image.width))
+    else:
+        return data
+
+    # Remember the source format before modifying the image, draft() and thumbnail() work in place.
+    format_ = image.format or "JPEG"
+    # For JPEGs draft() lets libjpeg decode directly to a fraction of the full resolution.
+    image.draft(None, size)
+    image.thumbnail(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    buffer = io.BytesIO()
+    if format_ == "JPEG":
+        image.save(buffer, format=format_, quality=85)
+    else:
+        image.save(buffer, format=format_)
+    return buffer.getvalue()
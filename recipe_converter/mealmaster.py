@@ -1,17 +1,17 @@
 import collections.abc
 import dataclasses
-import io
 import re
+import sys
 from typing import TextIO
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class IngredientsGroup:
     title: str
     ingredients: list[str] = dataclasses.field(default_factory=list)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Recipe:
     title: str = ""
     description: str = ""
@@ -19,7 +19,6 @@ class Recipe:
     cook_time: str = ""
     prep_time: str = ""
     total_time: str = ""
-    total_time: str = ""
     categories: list[str] = dataclasses.field(default_factory=list)
     ingredients_groups: list[IngredientsGroup] = dataclasses.field(default_factory=list)
     instructions: str = ""
@@ -29,27 +28,32 @@ class Recipe:
 
 
 class Patterns:
-    START_RECIPE = re.compile(r"MMMMM(-)+.*\n")
-    END_RECIPE = re.compile(r"MMMMM\n")
     SUBHEADING = re.compile(r"MMMMM(-)+.*-+\n")
-
-    TITLE_LINE = re.compile(r"^\s*Title:\s*(.+)", re.MULTILINE)
-    CATEGORIES_LINE = re.compile(r"^\s*Categories:\s*(.+)", re.MULTILINE)
-    SERVINGS_LINE = re.compile(r"^\s*Servings:\s*(.+)", re.MULTILINE)
-    PREP_TIME_LINE = re.compile(r"^\s*Prep(?:aration)? Time:\s*(.+)", re.MULTILINE | re.IGNORECASE)
-    COOK_TIME_LINE = re.compile(r"^\s*Cook(?:ing)? Time:\s*(.+)", re.MULTILINE | re.IGNORECASE)
-    TOTAL_TIME_LINE = re.compile(r"^\s*Total Time:\s*(.+)", re.MULTILINE | re.IGNORECASE)
-    DESCRIPTION = re.compile(r"^\s*Description?:\s*(.+)", re.MULTILINE | re.IGNORECASE)
-    NOTES_LINE = re.compile(r"^\s*Notes?:\s*(.+)", re.MULTILINE | re.IGNORECASE)
+    # A whole recipe: a start marker line, the recipe body, and the end marker line.
+    RECIPE_BLOCK = re.compile(r"^MMMMM-+[^\n]*\n(.*?)^MMMMM\n", re.MULTILINE | re.DOTALL)
+
+    # Single alternation for all header fields. The group names match the attributes of
+    # :class:`Recipe`, so a match can be dispatched on ``match.lastgroup``.
+    HEADER_LINE = re.compile(
+        r"^\s*(?:"
+        r"Title:\s*(?P<title>.+)"
+        r"|Categories:\s*(?P<categories>.+)"
+        r"|Servings:\s*(?P<servings>.+)"
+        r"|(?i:Prep(?:aration)? Time):\s*(?P<prep_time>.+)"
+        r"|(?i:Cook(?:ing)? Time):\s*(?P<cook_time>.+)"
+        r"|(?i:Total Time):\s*(?P<total_time>.+)"
+        r"|(?i:Description?):\s*(?P<description>.+)"
+        r"|(?i:Notes?):\s*(?P<notes>.+)"
+        r")"
+    )
 
     SOURCE_COMMENT_LINE = re.compile(r"^::Quelle\s+:\s+:\s+(.+)", re.MULTILINE | re.IGNORECASE)
     CATEGORIES_COMMENT_LINE = re.compile(r"^::Stichworte\s+:\s+:\s(.+)", re.MULTILINE | re.IGNORECASE)
     NUTRITIONAL_LINE = re.compile(r"^::Energie\s+:\s+:\s(.+)", re.MULTILINE | re.IGNORECASE)
-    COMMENT_LINE = re.compile(r"^::(.+)", re.MULTILINE)
-    MULTI_SPACE = re.compile(r"\s+")
+    MULTI_NEWLINE = re.compile(r"\n{2,}")
 
 
-def _parse_header(recipe: Recipe, f: TextIO) -> None:
+def _parse_header(recipe: Recipe, f: collections.abc.Iterator[str]) -> None:
     """Parse the header of a Meal-Master recipe.
 
     Generally the header contains the title, categories, and servings.
@@ -60,9 +64,10 @@ def _parse_header(recipe: Recipe, f: TextIO) -> None:
         Servings: 4 Portionen
 
     :param recipe: Recipe object to update.
-    :param f: file-like object to read from.
+    :param f: Iterator of lines to read from.
     """
     started = False
+    match_header_line = Patterns.HEADER_LINE.match
 
     for line in f:
         if not line.strip():
@@ -70,135 +75,127 @@ def _parse_header(recipe: Recipe, f: TextIO) -> None:
                 break
             else:
                 continue
-        title_match = Patterns.TITLE_LINE.match(line)
-        if title_match:
-            recipe.title = title_match.group(1).title()
-            started = True
-            continue
-
-        categories_match = Patterns.CATEGORIES_LINE.match(line)
-        if categories_match:
-            recipe.categories = [category.strip() for category in categories_match.group(1).split(",")]
-            started = True
-            continue
-
-        servings_match = Patterns.SERVINGS_LINE.match(line)
-        if servings_match:
-            recipe.servings = servings_match.group(1)
-            started = True
-            continue
-
-        prep_time_match = Patterns.PREP_TIME_LINE.match(line)
-        if prep_time_match:
-            started = True
-            recipe.prep_time = prep_time_match.group(1)
-            continue
-
-        cook_time_match = Patterns.COOK_TIME_LINE.match(line)
-        if cook_time_match:
-            started = True
-            recipe.cook_time = cook_time_match.group(1)
-            continue
-
-        total_time_match = Patterns.TOTAL_TIME_LINE.match(line)
-        if total_time_match:
-            started = True
-            recipe.total_time = total_time_match.group(1)
-            continue
-
-        description_match = Patterns.DESCRIPTION.match(line)
-        if description_match:
-            started = True
-            recipe.description = description_match.group(1)
-            continue
-
-        note_match = Patterns.NOTES_LINE.match(line)
-        if note_match:
-            started = True
+        # Every header field contains a colon, skip other lines without touching the regex.
+        if ":" not in line:
+            continue
+        header_match = match_header_line(line)
+        if not header_match:
+            continue
+        started = True
+        field = header_match.lastgroup
+        value = header_match.group(field)
+        if field == "title":
+            recipe.title = value.title()
+        elif field == "categories":
+            # Interning shares the few distinct category strings across all recipes of a
+            # collection, dict.fromkeys drops duplicates while keeping the order.
+            categories = (sys.intern(category.strip()) for category in value.split(","))
+            recipe.categories = list(dict.fromkeys(categories))
+        elif field == "notes":
             if recipe.notes:
                 recipe.notes += "\n"
-            recipe.notes += note_match.group(1)
-            continue
+            recipe.notes += value
+        else:
+            setattr(recipe, field, value)
+
 
+def _finalize_ingredients_group(group: IngredientsGroup, fragments: list[list[str]]) -> IngredientsGroup:
+    """Join the per-ingredient fragments collected during parsing into the group's ingredients."""
+    group.ingredients = [" ".join(parts) for parts in fragments]
+    return group
 
-def _parse_ingredients_groups(buffer: io.StringIO) -> list[IngredientsGroup]:
+
+def _parse_ingredients_groups(buffer: collections.abc.Iterable[str]) -> list[IngredientsGroup]:
     """Parse the ingredient groups from the ingredients section of a Meal-Master recipe.
     :return: List of ingredient groups
     """
     ingredients_group: IngredientsGroup | None = None
     ingredients_groups = []
+    # Fragments of the ingredients in the current group, continuation lines append to the
+    # last fragment list and each ingredient is joined once when the group is finalized.
+    fragments: list[list[str]] = []
+    match_subheading = Patterns.SUBHEADING.match
     for line in buffer:
         if not line.strip():
             if ingredients_group is not None:
                 # We are at the end of the ingredients, so we need to add the current group to the list.
-                ingredients_groups.append(ingredients_group)
+                ingredients_groups.append(_finalize_ingredients_group(ingredients_group, fragments))
                 ingredients_group = None
             break
-        subheading_match = Patterns.SUBHEADING.match(line)
+        # Cheap prefix check before running the subheading regex, most lines are ingredients.
+        subheading_match = match_subheading(line) if line.startswith("MMMMM") else None
         if subheading_match:
             if ingredients_group:
                 # We are not at the beginning of the file, so we need to add the previous group to the list.
-                ingredients_groups.append(ingredients_group)
+                ingredients_groups.append(_finalize_ingredients_group(ingredients_group, fragments))
             ingredients_group = IngredientsGroup(title=subheading_match.group(1))
+            fragments = []
             continue
         if not ingredients_group:
             # We are at the beginning of the file, so we need to create a default group.
             ingredients_group = IngredientsGroup(title="")
-        stripped_line = Patterns.MULTI_SPACE.sub(" ", line.strip())
+            fragments = []
+        stripped_line = " ".join(line.split())
         if stripped_line.startswith("-"):
             # Mealmaster only supports a limited line length for ingredients. Longer lines are continued with a '-' character.
-            if not ingredients_group.ingredients:
+            if not fragments:
                 # There is no previous ingredient to continue.
-                ingredients_group.ingredients.append(stripped_line[2:])
+                fragments.append([stripped_line[2:]])
             else:
-                ingredients_group.ingredients[-1] += " "
-                ingredients_group.ingredients[-1] += stripped_line[2:]
+                fragments[-1].append(stripped_line[2:])
             continue
 
-        ingredients_group.ingredients.append(stripped_line)
+        fragments.append([stripped_line])
 
     if ingredients_group is not None:
         # We are at the end of the ingredients, so we need to add the current group to the list.
-        ingredients_groups.append(ingredients_group)
+        ingredients_groups.append(_finalize_ingredients_group(ingredients_group, fragments))
     return ingredients_groups
 
 
-def _parse_ingredients(buffer: TextIO) -> list[IngredientsGroup]:
-    ingredients_buffer = io.StringIO()
-    for line in buffer:
-        if not line.strip():
-            break
-        ingredients_buffer.write(line)
-    ingredients_buffer.seek(0)
-    return _parse_ingredients_groups(ingredients_buffer)
+def _parse_ingredients(buffer: collections.abc.Iterator[str]) -> list[IngredientsGroup]:
+    def _section() -> collections.abc.Generator[str, None, None]:
+        for line in buffer:
+            if not line.strip():
+                return
+            yield line
 
+    return _parse_ingredients_groups(_section())
 
-def _parse_recipe(buffer: TextIO) -> Recipe:
+
+def _parse_recipe(lines: collections.abc.Sequence[str]) -> Recipe:
     """Parse a Meal-Master recipe.
 
-    :param f: File-like object to read from.
+    :param lines: Lines of the recipe body.
     :return: Recipe object.
     """
     recipe = Recipe()
+    buffer = iter(lines)
     try:
         _parse_header(recipe, buffer)
     except Exception as exc:
-        buffer.seek(0)
-        raise ValueError(f"Error parsing header of recipe {buffer.readline()}") from exc
+        raise ValueError(f"Error parsing header of recipe {lines[0] if lines else ''}") from exc
 
     try:
         recipe.ingredients_groups = _parse_ingredients(buffer)
     except Exception as exc:
         raise ValueError(f"Error parsing ingredients of recipe {recipe.title}") from exc
 
-    instructions = io.StringIO()
+    instruction_lines: list[str] = []
+    match_nutritional_line = Patterns.NUTRITIONAL_LINE.match
+    match_categories_comment_line = Patterns.CATEGORIES_COMMENT_LINE.match
+    match_source_comment_line = Patterns.SOURCE_COMMENT_LINE.match
     for line in buffer:
-        nutrition_match = Patterns.NUTRITIONAL_LINE.match(line)
+        if not line.startswith("::"):
+            instruction_lines.append(line)
+            continue
+
+        nutrition_match = match_nutritional_line(line)
         if nutrition_match:
             recipe.nutrition = nutrition_match.group(1)
             continue
 
-        categories_comment_match = Patterns.CATEGORIES_COMMENT_LINE.match(line)
+        categories_comment_match = match_categories_comment_line(line)
         if categories_comment_match:
             for cat in categories_comment_match.group(1).split():
                 cat = cat.replace(",", "")
@@ -206,33 +203,20 @@ def _parse_recipe(buffer: TextIO) -> Recipe:
                     recipe.categories.append(cat)
             continue
 
-        source_comment_match = Patterns.SOURCE_COMMENT_LINE.match(line)
+        source_comment_match = match_source_comment_line(line)
         if source_comment_match and not recipe.source:
             recipe.source = source_comment_match.group(1)
-            continue
-
-        if Patterns.COMMENT_LINE.match(line):
-            continue
-        instructions.write(line)
-    instructions.seek(0)
-    recipe.instructions = instructions.read().strip().replace("\n\n", "\n")
+        # Other comment lines are never part of the instructions.
+    recipe.instructions = Patterns.MULTI_NEWLINE.sub("\n", "".join(instruction_lines).strip())
 
     return recipe
 
 
 def parse(f: TextIO) -> collections.abc.Generator[Recipe, None, None]:
-    recipe_started = False
-    # Buffer for the text of the current recipe.
-    recipe_buffer = io.StringIO()
-    for line in f:
-        if Patterns.START_RECIPE.match(line):
-            recipe_started = True
-            continue
-        if recipe_started and Patterns.END_RECIPE.match(line):
-            recipe_started = False
-            recipe_buffer.seek(0)
-            yield _parse_recipe(recipe_buffer)
-            recipe_buffer = io.StringIO()
-            continue
-        if recipe_started:
-            recipe_buffer.write(line)
+    text = f.read()
+    for block_match in Patterns.RECIPE_BLOCK.finditer(text):
+        # Marker lines inside a block (e.g. subheadings) are not part of the recipe body.
+        recipe_lines = [
+            line for line in block_match.group(1).splitlines(keepends=True) if not line.startswith("MMMMM-")
+        ]
+        yield _parse_recipe(recipe_lines)
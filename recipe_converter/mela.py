@@ -1,7 +1,12 @@
+import asyncio
 import base64
+import concurrent.futures
+import functools
+import json
 import logging
 import pathlib
 import random
+import time
 
 import click
 import primp
@@ -17,7 +22,7 @@ def mela():
     pass
 
 
-IMPERSONATION_OPTIONS = [
+IMPERSONATION_OPTIONS = (
     "safari_ios_16.5",
     "safari_ios_17.2",
     "safari_ios_17.4.1",
@@ -47,50 +52,198 @@ IMPERSONATION_OPTIONS = [
     "edge_131",
     "firefox_109",
     "firefox_133",
-]
+)
 
 
-@mela.command(help="Search images for recipes based on DuckDuckGo image search.")
-@click.option("--scale-width", type=int, help="Scale down images to this width.")
-@click.argument("input", type=pathlib.Path)
-@click.argument("output", type=pathlib.Path)
-def search_images(input: pathlib.Path, output: pathlib.Path, scale_width: int | None):
-    recipes = list(melarecipes.parse(input))
-    client = primp.Client(impersonate=random.choice(IMPERSONATION_OPTIONS), verify=False)
+# Maximum number of recipes for which images are searched and downloaded concurrently.
+MAX_CONCURRENT_FETCHES = 8
+# Maximum number of DuckDuckGo searches running at the same time, kept below the download
+# concurrency to avoid hammering the search endpoint.
+MAX_CONCURRENT_SEARCHES = 4
+# Timeout in seconds for image downloads.
+DOWNLOAD_TIMEOUT = 20
+# Number of attempts for a single image download.
+DOWNLOAD_ATTEMPTS = 3
+
+SEARCH_CACHE_PATH = pathlib.Path("~/.cache/recipe-converter/image-search.json").expanduser()
+# Lifetime in seconds of cached image search results.
+SEARCH_CACHE_TTL = 30 * 24 * 60 * 60
+
 
-    ddgs = DDGS()
+def _load_search_cache() -> dict[str, dict]:
+    """Load the image search cache from disk, dropping expired entries.
+
+    :return: Mapping of search keys to entries with the image URL and a timestamp.
+    """
     try:
-        for recipe in recipes:
-            if recipe.images:
-                # We have at least one image, so we don't need to search for more
-                _logger.info("Image already present for '%s'", recipe.title)
-                continue
+        entries = json.loads(SEARCH_CACHE_PATH.read_text())
+        now = time.time()
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict) and "url" in entry and now - entry["timestamp"] < SEARCH_CACHE_TTL
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        # A missing, unreadable or malformed cache (e.g. from an older format) starts fresh.
+        return {}
+
+
+def _save_search_cache(cache: dict[str, dict]) -> None:
+    """Write the image search cache to disk, failures are only logged."""
+    try:
+        SEARCH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SEARCH_CACHE_PATH.write_text(json.dumps(cache))
+    except OSError as exc:
+        _logger.debug("Failed to write search cache %s: %s", SEARCH_CACHE_PATH, exc)
+
+
+@functools.cache
+def _ddgs() -> DDGS:
+    """Get the shared DuckDuckGo search client, created on first use."""
+    return DDGS()
+
+
+@functools.cache
+def _client() -> primp.Client:
+    """Get the shared HTTP client for image downloads, created on first use."""
+    return primp.Client(
+        impersonate=random.choice(IMPERSONATION_OPTIONS),
+        verify=False,
+        timeout=DOWNLOAD_TIMEOUT,
+        follow_redirects=True,
+    )
+
+
+def _get_with_retries(client: primp.Client, url: str):
+    """Perform a GET request, retrying transient failures with exponential backoff.
+
+    Connection errors and 5xx responses are retried up to :data:`DOWNLOAD_ATTEMPTS` times.
+
+    :param client: HTTP client to use.
+    :param url: URL to download.
+    :return: The response object.
+    """
+    last_exc: Exception | None = None
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        if attempt:
+            time.sleep(2 ** (attempt - 1) + random.random())
+        try:
+            resp = client.get(url)
+        except Exception as exc:
+            last_exc = exc
+            continue
+        if resp.status_code >= 500:
+            last_exc = RuntimeError(f"Server error {resp.status_code} for {url}")
+            continue
+        return resp
+    assert last_exc is not None
+    raise last_exc
+
+
+async def _fetch_image(
+    recipe: melarecipes.Recipe,
+    ddgs: DDGS,
+    client: primp.Client,
+    semaphore: asyncio.Semaphore,
+    search_executor: concurrent.futures.ThreadPoolExecutor,
+    image_cache: dict[str, bytes],
+    search_cache: dict[str, dict],
+    scale_width: int | None,
+) -> None:
+    """Search an image for a single recipe and download it into the recipe.
+
+    The synchronous DDGS search and the HTTP download run in worker threads, so multiple
+    recipes can be fetched concurrently.
+
+    :param recipe: Recipe to fetch an image for, updated in place.
+    :param ddgs: DuckDuckGo search client.
+    :param client: HTTP client to download images with.
+    :param semaphore: Semaphore bounding the number of concurrent fetches.
+    :param search_executor: Executor the DDGS searches run on.
+    :param image_cache: Cache of downloaded image bytes keyed by URL, shared across recipes.
+    :param search_cache: Persistent cache of search results keyed by title and search parameters.
+    :param scale_width: Width to scale down the downloaded image to, optional.
+    """
+    async with semaphore:
+        search_key = f"{recipe.title}|photo|Large"
+        cached_search = search_cache.get(search_key)
+        if cached_search is not None:
+            _logger.info("Using cached image search result for '%s'", recipe.title)
+            url = cached_search["url"]
+        else:
             _logger.info("Searching for images for '%s'", recipe.title)
-            results = ddgs.images(
-                recipe.title,
-                type_image="photo",
-                size="Large",
-                max_results=1,
+            results = await asyncio.get_running_loop().run_in_executor(
+                search_executor,
+                functools.partial(
+                    ddgs.images,
+                    recipe.title,
+                    type_image="photo",
+                    size="Large",
+                    max_results=1,
+                ),
             )
             if not results:
                 _logger.warning("No images found for '%s'", recipe.title)
-                continue
+                return
+            url = results[0]["image"]
+            search_cache[search_key] = {"url": url, "timestamp": time.time()}
+        img = image_cache.get(url)
+        if img is None:
             _logger.info("Download image for '%s'", recipe.title)
             try:
-                resp = client.get(results[0]["image"])
+                resp = await asyncio.to_thread(_get_with_retries, client, url)
             except Exception as exc:
                 _logger.error("Failed to download image for '%s': %s", recipe.title, exc)
-                continue
-            try:
-                img = resp.content
-                if scale_width:
-                    img = image.scale_down(img, width=scale_width)
-                recipe.images.append(base64.b64encode(img).decode())
-            except Exception as exc:
-                _logger.error("Failed to scale image for '%s': %s", recipe.title, exc)
-                continue
+                return
+            img = resp.content
+            image_cache[url] = img
+        else:
+            _logger.info("Reusing already downloaded image for '%s'", recipe.title)
+        try:
+            if scale_width:
+                img = image.scale_down(img, width=scale_width)
+            recipe.images.append(base64.b64encode(memoryview(img)).decode("ascii"))
+        except Exception as exc:
+            _logger.error("Failed to scale image for '%s': %s", recipe.title, exc)
+
+
+async def _search_images(
+    recipes: list[melarecipes.Recipe],
+    ddgs: DDGS,
+    client: primp.Client,
+    search_cache: dict[str, dict],
+    scale_width: int | None,
+) -> None:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    image_cache: dict[str, bytes] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SEARCHES) as search_executor:
+        async with asyncio.TaskGroup() as tg:
+            for recipe in recipes:
+                if recipe.images:
+                    # We have at least one image, so we don't need to search for more
+                    _logger.info("Image already present for '%s'", recipe.title)
+                    continue
+                tg.create_task(
+                    _fetch_image(
+                        recipe, ddgs, client, semaphore, search_executor, image_cache, search_cache, scale_width
+                    )
+                )
 
+
+@mela.command(help="Search images for recipes based on DuckDuckGo image search.")
+@click.option("--scale-width", type=int, help="Scale down images to this width.")
+@click.argument("input", type=pathlib.Path)
+@click.argument("output", type=pathlib.Path)
+def search_images(input: pathlib.Path, output: pathlib.Path, scale_width: int | None):
+    recipes = list(melarecipes.parse(input))
+    client = _client()
+
+    ddgs = _ddgs()
+    search_cache = _load_search_cache()
+    try:
+        asyncio.run(_search_images(recipes, ddgs, client, search_cache, scale_width))
     finally:
+        _save_search_cache(search_cache)
         melarecipes.write(output, recipes)
 
 
@@ -106,8 +259,8 @@ def scale_down_images(input: pathlib.Path, output: pathlib.Path, scale_width: in
                 for i, img in enumerate(recipe.images):
                     try:
                         recipe.images[i] = base64.b64encode(
-                            image.scale_down(base64.b64decode(img), width=scale_width)
-                        ).decode()
+                            memoryview(image.scale_down(base64.b64decode(img), width=scale_width))
+                        ).decode("ascii")
                     except Exception as exc:
                         _logger.error("Failed to scale image for '%s': %s", recipe.title, exc)
     finally:
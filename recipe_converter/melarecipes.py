@@ -1,13 +1,24 @@
+import binascii
 import collections.abc
-import hashlib
 import pathlib
-import re
+import string
 import uuid
 import zipfile
 
 import pydantic
 
 
+class _DeletingTable(dict):
+    """Translation table for :meth:`str.translate` that deletes every character it does not contain."""
+
+    def __missing__(self, key: int) -> None:
+        return None
+
+
+# Keeps ASCII letters, digits and whitespace, everything else is deleted.
+_FILENAME_TABLE = _DeletingTable({ord(c): c for c in string.ascii_letters + string.digits + string.whitespace})
+
+
 class Recipe(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(populate_by_name=True)
 
@@ -56,20 +67,36 @@ class Recipe(pydantic.BaseModel):
 
     def filename(self) -> pathlib.Path:
         """Get a filename for the recipe. It contains a kebap-case version of the title and a hash of the id."""
-        cleaned_str = re.sub(r"[^a-zA-Z0-9\s]", "", self.title)
+        cleaned_str = self.title.translate(_FILENAME_TABLE)
         kebap_str = cleaned_str.replace(" ", "-").lower()
-        return pathlib.Path(f"{kebap_str}-{hashlib.sha256(self.id.encode()).hexdigest()[:6]}.melarecipe")
+        return pathlib.Path(f"{kebap_str}-{binascii.crc32(self.id.encode()) & 0xFFFFFF:06x}.melarecipe")
+
+
+_RECIPE_ADAPTER = pydantic.TypeAdapter(Recipe)
+# The model's core serializer, used directly to skip the TypeAdapter dispatch per recipe.
+_RECIPE_SERIALIZER = Recipe.__pydantic_serializer__
+
 
+def write(path: pathlib.Path, recipes: collections.abc.Iterable[Recipe]) -> int:
+    """Write recipes to a melarecipes archive.
 
-def write(path: pathlib.Path, recipes: list[Recipe]) -> None:
-    ta = pydantic.TypeAdapter(Recipe)
+    :param path: Path of the archive to write.
+    :param recipes: Recipes to write, consumed lazily.
+    :return: Number of recipes written.
+    """
+    num_recipes = 0
     with zipfile.ZipFile(path, "w") as zip_file:
         for recipe in recipes:
-            zip_file.writestr(str(recipe.filename()), ta.dump_json(recipe, by_alias=True))
+            # Stream the serialized recipe into the archive entry instead of going through
+            # writestr, which buffers another copy of the whole payload.
+            with zip_file.open(str(recipe.filename()), "w") as file:
+                file.write(_RECIPE_SERIALIZER.to_json(recipe, by_alias=True))
+            num_recipes += 1
+    return num_recipes
 
 
 def parse(path: pathlib.Path) -> collections.abc.Generator[Recipe]:
     with zipfile.ZipFile(path, "r") as archive:
-        for filename in archive.namelist():
-            with archive.open(filename) as file:
-                yield Recipe.model_validate_json(file.read())
+        for info in archive.infolist():
+            # Read the entry in one shot, which skips the ZipExtFile wrapper per recipe.
+            yield _RECIPE_ADAPTER.validate_json(archive.read(info))
@@ -6,29 +6,30 @@ from typing import Literal
 
 from recipe_converter import melarecipes
 
-MULTI_SPACE_PATTERN = re.compile(r"\s+")
 # https://www.wedesoft.de/software/2020/07/07/mealmaster/
+# Units and conversions are padded with spaces so only whole tokens are matched.
 UNIT_CONVERSIONS = {
-    "dr": "Tropfen",
-    "ds": "Spritzer",
-    "bn": "Bund",
-    "sm": "Kleine",
-    "md": "Mittlere",
-    "lg": "Große",
-    "St": "",
-    "Sk": "",
-    "cn": "Dose",
-    "pn": "Prise",
-    "fl": "fl. oz.",
-    "tbsp": "EL",
-    "tsp": "TL",
-    "c": "Tasse",
-    "pk": "Pkg",
-    "sl": "Scheibe",
-    "Ms": "Msp",
+    " dr ": " Tropfen ",
+    " ds ": " Spritzer ",
+    " bn ": " Bund ",
+    " sm ": " Kleine ",
+    " md ": " Mittlere ",
+    " lg ": " Große ",
+    " St ": "  ",
+    " Sk ": "  ",
+    " cn ": " Dose ",
+    " pn ": " Prise ",
+    " fl ": " fl. oz. ",
+    " tbsp ": " EL ",
+    " tsp ": " TL ",
+    " c ": " Tasse ",
+    " pk ": " Pkg ",
+    " sl ": " Scheibe ",
+    " Ms ": " Msp ",
 }
 
-UNIT_CONVERSIONS = {f" {key} ": f" {value} " for key, value in UNIT_CONVERSIONS.items()}
+# Single alternation over all units, so each line is scanned once instead of once per unit.
+UNIT_PATTERN = re.compile("|".join(re.escape(unit) for unit in UNIT_CONVERSIONS))
 
 
 def input_with_default(_prompt: str, default: str | None) -> str:
@@ -94,13 +95,14 @@ def main():
             ingredients = recipe.ingredients.split("\n")
             end = "\n" if namespace.confirm_all else ""
             for idx, ingredient in enumerate(ingredients):
-                for unit, conversion in UNIT_CONVERSIONS.items():
-                    new_ingredient = ingredient.replace(unit, conversion)
-                    if new_ingredient != ingredient:
-                        new_ingredient = MULTI_SPACE_PATTERN.sub(" ", new_ingredient.strip())
-                        print(f"Update unit of '{recipe.title}' from '{ingredient}' to '{new_ingredient}'", end=end)
-                        if namespace.confirm_all or confirm(" Confirm?", default="y"):
-                            ingredients[idx] = new_ingredient
+                # Most lines contain no unit token at all, reject them with a plain scan.
+                if not UNIT_PATTERN.search(ingredient):
+                    continue
+                new_ingredient = UNIT_PATTERN.sub(lambda match: UNIT_CONVERSIONS[match.group(0)], ingredient)
+                new_ingredient = " ".join(new_ingredient.split())
+                print(f"Update unit of '{recipe.title}' from '{ingredient}' to '{new_ingredient}'", end=end)
+                if namespace.confirm_all or confirm(" Confirm?", default="y"):
+                    ingredients[idx] = new_ingredient
             recipe.ingredients = "\n".join(ingredients)
     finally:
         melarecipes.write(namespace.output, recipes)